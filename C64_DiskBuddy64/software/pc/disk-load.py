@@ -59,8 +59,8 @@ def progress(percent=0, width=50):
 
 def readFile(fileindex):
     # Create output file
-    filename  = cleanstring(directory.filelist[fileindex]['name']) + '.prg'
-    blocksize = directory.filelist[fileindex]['size']
+    filename  = cleanstring(directory.filelist[fileindex].name) + '.prg'
+    blocksize = directory.filelist[fileindex].size
     print('Opening', filename, 'for writing ...')
     try:
         f = open(filename, 'wb')
@@ -69,10 +69,10 @@ def readFile(fileindex):
         raise AdpError('Failed to open ' + filename)
 
     # Start read operation
-    print('Transfering \"' + directory.filelist[fileindex]['name'] 
+    print('Transfering \"' + directory.filelist[fileindex].name 
                            + '\" to \"' + filename + '\" ...')
-    track  = directory.filelist[fileindex]['track']
-    sector = directory.filelist[fileindex]['sector']
+    track  = directory.filelist[fileindex].track
+    sector = directory.filelist[fileindex].sector
     starttime = time.time()
     if diskbuddy.startfastload(track, sector) > 0:
         f.close()
@@ -172,9 +172,9 @@ indices = list()
 index = 0
 counter = 1
 for file in directory.filelist:
-    if file['type'] == 'PRG' and file['size'] > 0:
+    if file.type == 'PRG' and file.size > 0:
         print(('(' + str(counter) + ')').ljust(5), end='')
-        print(('\"' + file['name'] + '\"').ljust(22), end='')
+        print(('\"' + file.name + '\"').ljust(22), end='')
         if counter % 2 == 0:
             print('')
         indices.append(index)
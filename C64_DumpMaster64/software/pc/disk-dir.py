@@ -93,12 +93,12 @@ print(directory.header)
 
 # Print files
 for file in directory.filelist:
-    line  = str(file['size']).ljust(5)
+    line  = str(file.size).ljust(5)
     line += '\"'
-    line += (file['name'] + '\"').ljust(19)
-    line += file['type']
-    if file['locked']: line += '<'
-    if not file['closed']: line += '*'
+    line += (file.name + '\"').ljust(19)
+    line += file.type
+    if file.locked: line += '<'
+    if not file.closed: line += '*'
     print(line.upper())
 
 
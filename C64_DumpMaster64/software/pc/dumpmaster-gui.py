@@ -691,8 +691,8 @@ def loadFiles():
 
     def readFile(fileindex):
         # Create output file
-        filename  = cleanstring(directory.filelist[fileindex]['name']) + '.prg'
-        blocksize = directory.filelist[fileindex]['size']
+        filename  = cleanstring(directory.filelist[fileindex].name) + '.prg'
+        blocksize = directory.filelist[fileindex].size
         try:
             f = open(folder + '/' + filename, 'wb')
         except:
@@ -700,11 +700,11 @@ def loadFiles():
             return 1
 
         # Start read operation
-        progress.setactivity('Transfering \"' + directory.filelist[fileindex]['name'] 
+        progress.setactivity('Transfering \"' + directory.filelist[fileindex].name 
                              + '\"\nto \"' + filename + '\" ...')
         progress.setvalue(0)
-        track  = directory.filelist[fileindex]['track']
-        sector = directory.filelist[fileindex]['sector']
+        track  = directory.filelist[fileindex].track
+        sector = directory.filelist[fileindex].sector
         if dumpmaster.startfastload(track, sector) > 0:
             f.close()
             messagebox.showerror('Error', 'Failed to start disk operation !')
@@ -793,9 +793,9 @@ def loadFiles():
     indices = list()
     index = 0
     for file in directory.filelist:
-        if file['type'] == 'PRG' and file['size'] > 0:
-            line  = str(file['size']).rjust(4) + '  '
-            line += ('"' + file['name'] + '"').ljust(20)
+        if file.type == 'PRG' and file.size > 0:
+            line  = str(file.size).rjust(4) + '  '
+            line += ('"' + file.name + '"').ljust(20)
             line += 'PRG'
             l.insert('end', line)
             indices.append(index)
@@ -21,17 +21,22 @@
 # None
 
 
+from array import array
+from functools import cached_property
+from struct import Struct
+
+
 # ===================================================================================
 # BAM Class - Working with the BAM
 # ===================================================================================
 
 class BAM:
     def __init__(self, bam):
-        self.bam = bam
+        self.bam = None if bam is None else memoryview(bytearray(bam))
 
     # Get disk name
     def getdiskname(self):
-        return PETtoASC(PETdelpadding(self.bam[0x90:0xA0]))
+        return PETtoASC(bytes(self.bam[0x90:0xA0]).rstrip(b'\xa0'))
 
     # Get disk ID
     def getdiskident(self):
@@ -39,72 +44,124 @@ class BAM:
 
     # Generate header for directory
     def getheader(self):
-        header  = '0    \"'
-        header += (self.getdiskname() + '\"').ljust(19)
-        header += self.getdiskident().ljust(3)
-        header += PETtoASC(self.bam[0xA5:0xA7])
-        return header.upper()
+        name   = bytes(self.bam[0x90:0xA0]).rstrip(b'\xa0').translate(PETtoASCbytes)
+        iddos  = bytes(self.bam[0xA2:0xA7]).translate(PETtoASCbytes)
+        header = (b'0    \"' + name + b'\"').ljust(25) + iddos[:2] + b' ' + iddos[3:]
+        return header.decode('latin-1').upper()
 
     # Calculate free blocks shown in directory (exclude track 18)
     def getblocksfree(self):
-        blocksfree = 0
-        for x in range(0x04, 0x90, 0x04): 
-            if not x == 0x48: blocksfree += self.bam[x]
-        return blocksfree
+        blocksfree = self.bam[0x04:0x90:0x04]
+        return sum(blocksfree) - blocksfree[17]
 
-    # Get total number of allocated sectors on disk
+    # Get total number of allocated sectors on disk (tracks 1-35)
     def getallocated(self):
-        allocated = 0
-        for x in range(0x04, 0x90, 0x04): 
-            allocated += (getsectors(x // 4) - self.bam[x])
-        return allocated
+        return TRACKSTART[36] - sum(self.bam[0x04:0x90:0x04])
 
     # Check if specified sector on specified track is free (not allocated)
     def blockisfree(self, track, sector):
-        return self.bam[4 * track + 1 + (sector // 8)] & (1 << (sector % 8)) > 0
+        return self.bam[4 * track + 1 + (sector >> 3)] & BITMASK[sector & 7] > 0
 
     # Allocate a block in the BAM
     def allocateblock(self, track, sector):
-        temp  = self.bam[4 * track + 1 + (sector // 8)]
-        temp &= 255 - (1 << (sector % 8))
-        self.bam[4 * track + 1 + (sector // 8)] = temp
+        self.bam[4 * track + 1 + (sector >> 3)] &= BITCLEAR[sector & 7]
 
     # De-allocate a block in the BAM
     def deallocateblock(self, track, sector):
-        temp  = self.bam[4 * track + 1 + (sector // 8)]
-        temp |= (1 << (sector % 8))
-        self.bam[4 * track + 1 + (sector // 8)] = temp
+        self.bam[4 * track + 1 + (sector >> 3)] |= BITMASK[sector & 7]
+
+    # Allocate all blocks in a list of (track, sector) pairs
+    def allocateblocks(self, blocks):
+        bam = self.bam
+        for track, sector in blocks:
+            bam[4 * track + 1 + (sector >> 3)] &= BITCLEAR[sector & 7]
+
+    # De-allocate all blocks in a list of (track, sector) pairs
+    def deallocateblocks(self, blocks):
+        bam = self.bam
+        for track, sector in blocks:
+            bam[4 * track + 1 + (sector >> 3)] |= BITMASK[sector & 7]
 
 
 # ===================================================================================
 # DIR Class - Working with the Directory
 # ===================================================================================
 
+class DirEntry:
+    __slots__ = ('base', 'type', 'locked', 'closed', 'track', 'sector', 'name', 'size')
+
+
 class Dir:
     def __init__(self, dirblocks):
-        self.bam = BAM(dirblocks[:256])
-        self.dir = dirblocks[256:]
+        dirblocks = memoryview(dirblocks).cast('B')
+        self.bam  = BAM(dirblocks[:256])
+        self.dir  = dirblocks[256:]
         self.dirpass()
 
+    # Disk name, ID, header and free blocks are only taken from the BAM when needed
+    @cached_property
+    def title(self):
+        return self.bam.getdiskname()
+
+    @cached_property
+    def ident(self):
+        return self.bam.getdiskident()
+
+    @cached_property
+    def blocksfree(self):
+        return self.bam.getblocksfree()
+
+    @cached_property
+    def header(self):
+        return self.bam.getheader()
+
+    # Collect the used directory entries as parallel arrays (one element per file)
     def dirpass(self):
-        self.title      = self.bam.getdiskname()
-        self.ident      = self.bam.getdiskident()
-        self.blocksfree = self.bam.getblocksfree()
-        self.header     = self.bam.getheader()
-        self.filelist   = list()
-        for ptr in range(len(self.dir) // 0x20):
-            base = 0x20 * ptr
-            if self.dir[base+0x02] > 0:
-                file = dict()
-                file['base']    = base
-                file['type']    = FILETYPES[self.dir[base+0x02] & 0x07]
-                file['locked']  = ((self.dir[base+0x02] & 0x40) > 0)
-                file['closed']  = ((self.dir[base+0x02] & 0x80) > 0)
-                file['track']   = self.dir[base+0x03]
-                file['sector']  = self.dir[base+0x04]
-                file['name']    = PETtoASC(PETdelpadding(self.dir[base+0x05:base+0x15]))
-                file['size']    = int.from_bytes(self.dir[base+0x1E:base+0x20], byteorder='little')
-                self.filelist.append(file)
+        self.bases   = array('I')
+        self.types   = array('B')               # filetype byte incl. locked/closed flags
+        self.tracks  = array('B')
+        self.sectors = array('B')
+        self.sizes   = array('H')
+        self.names   = list()
+        for x in ('title', 'ident', 'blocksfree', 'header', 'filelist'):
+            self.__dict__.pop(x, None)          # drop cached values of a previous pass
+        names = bytes(self.dir).translate(PETtoASCpadbytes).decode('latin-1')
+        entries = DIRENTRY.iter_unpack(self.dir[:len(self.dir) & ~0x1F])
+        for base, (ftype, track, sector, size) in zip(range(0, len(self.dir), 0x20), entries):
+            if ftype == 0 and track == 0:
+                break                           # never used entry: no more files follow
+            if ftype > 0:
+                self.bases.append(base)
+                self.types.append(ftype)
+                self.tracks.append(track)
+                self.sectors.append(sector)
+                self.sizes.append(size)
+                self.names.append(names[base+0x05:base+0x15].replace('\xff', ''))
+
+    # Number of files in the directory
+    def __len__(self):
+        return len(self.names)
+
+    # Get directory entry of a file as a DirEntry object (a list of them for a slice)
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[x] for x in range(*index.indices(len(self)))]
+        ftype = self.types[index]
+        file = DirEntry()
+        file.base   = self.bases[index]
+        file.type   = FILETYPES[ftype & 0x07]
+        file.locked = ((ftype & 0x40) > 0)
+        file.closed = ((ftype & 0x80) > 0)
+        file.track  = self.tracks[index]
+        file.sector = self.sectors[index]
+        file.name   = self.names[index]
+        file.size   = self.sizes[index]
+        return file
+
+    # List of all directory entries
+    @cached_property
+    def filelist(self):
+        return [self[x] for x in range(len(self))]
 
 
 # ===================================================================================
@@ -113,23 +170,16 @@ class Dir:
 
 # Get number of sectors in track
 def getsectors(track):
-    if track <  1:  return 0
-    if track < 18:  return 21
-    if track < 25:  return 19
-    if track < 31:  return 18
-    if track < 41:  return 17
+    if 0 <= track < 42: return SECTORS[track]
     return 0
 
 # Get absolute sector number
 def getsectornumber(track, sector):
-    number = 0
-    for x in range(1, track):
-        number += getsectors(x)
-    return number + sector
+    return TRACKSTART[min(max(track, 0), 41)] + sector
 
 # Get pointer to track/sector in D64 file
 def getfilepointer(track, sector):
-    return 256 * getsectornumber(track, sector)
+    return TRACKOFFSET[min(max(track, 0), 41)] + (sector << 8)
 
 
 # ===================================================================================
@@ -138,30 +188,26 @@ def getfilepointer(track, sector):
 
 # Convert PETSCII bytes to ASCII string
 def PETtoASC(line):
-    result = ''
-    for x in line:
-        result += chr(PETtoASCtable[x])
-    return result
+    return bytes(line).translate(PETtoASCbytes).decode('latin-1')
 
 # Convert ASCII string to PETSCII string
 def ASCtoPET(line):
-    result = ''
-    for x in line:
-        result += chr(ASCtoPETtable[ord(x)])
-    return result
+    return line.encode('latin-1').translate(ASCtoPETbytes).decode('latin-1')
 
 # Delete $A0 padding in PETSCII bytes
 def PETdelpadding(line):
-    result = b''
-    for x in line:
-        if not x == 0xA0:
-              result += bytes([x])
-    return result
+    return bytes(line).translate(None, b'\xa0')
 
 # Remove character invalid for filenames
 def cleanstring(filename):
-    filename = filename.lstrip().rstrip().replace(' ', '_')
-    return ''.join(c for c in filename if c.isalnum() or c=='_' or c=='-')
+    return filename.strip().replace(' ', '_').translate(FILENAMEFILTER)
+
+# Translation table for cleanstring(), filled in on first use of each character:
+# alphanumerics, '_' and '-' map to themselves, all other characters to None
+class FilenameFilter(dict):
+    def __missing__(self, x):
+        self[x] = x if chr(x).isalnum() or chr(x) in '_-' else None
+        return self[x]
 
 
 # ===================================================================================
@@ -208,9 +254,37 @@ ASCtoPETtable = [
     0xf0,0xf1,0xf2,0xf3,0xf4,0xf5,0xf6,0xf7,0xf8,0xf9,0xfa,0xfb,0xfc,0xfd,0xfe,0xff]
 
 
+# Conversion tables as bytes for use with bytes.translate()
+PETtoASCbytes = bytes(PETtoASCtable)
+ASCtoPETbytes = bytes(ASCtoPETtable)
+
+# PETSCII to ASCII with $A0 padding marked as $FF (which the table never produces)
+PETtoASCpadbytes = PETtoASCbytes[:0xA0] + b'\xff' + PETtoASCbytes[0xA1:]
+
+
 # ===================================================================================
 # Various Constants
 # ===================================================================================
 
-# Filetypes
-FILETYPES = ['DEL', 'SEQ', 'PRG', 'USR', 'REL']
+# Filetypes (index = filetype byte & 0x07)
+FILETYPES = ('DEL', 'SEQ', 'PRG', 'USR', 'REL', '???', '???', '???')
+
+# Directory entry: filetype, track, sector, (name, REL/GEOS data skipped), size
+DIRENTRY = Struct('<2xBBB16x9xH')
+
+# Number of sectors per track (index = track number, tracks 1-40)
+# Speed zones start at tracks 18, 25 and 31 with 19, 18 and 17 sectors
+SECTORS = tuple((0 < x < 41) * (21 - 2 * (x >= 18) - (x >= 25) - (x >= 31)) for x in range(42))
+
+# Absolute sector number of the first sector of each track (index = track number)
+TRACKSTART = tuple(sum(SECTORS[:x]) for x in range(42))
+
+# Offset of the first sector of each track in a D64 file (index = track number)
+TRACKOFFSET = tuple(x << 8 for x in TRACKSTART)
+
+# Bit masks to set/clear a sector's bit in a BAM entry (index = sector % 8)
+BITMASK  = tuple(1 << x for x in range(8))
+BITCLEAR = tuple(0xFF ^ (1 << x) for x in range(8))
+
+# Characters removed by cleanstring() (all but alphanumerics, '_' and '-')
+FILENAMEFILTER = FilenameFilter()